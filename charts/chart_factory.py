@@ -3,10 +3,72 @@
 Chart creation utilities for MedSync Dashboard
 """
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from config import CHART_HEIGHT, TALL_CHART_HEIGHT, COLOR_SCHEMES
+import streamlit as st
+from config import (
+    CHART_HEIGHT, TALL_CHART_HEIGHT, COLOR_SCHEMES, CACHE_TTL, MAX_TREND_POINTS,
+    HEATMAP_TEXT_MIN_COUNT, NORMALIZED_AUTHORIZATION_COLUMN
+)
+from utils.cache_utils import dataframe_fingerprint
+from utils.data_processor import DataProcessor
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=64, show_spinner=False)
+def _daily_trend(fingerprint, _dates):
+    """Aggregate (and downsample) the daily processing counts once per date-column fingerprint."""
+    daily_counts = _dates.groupby(_dates.dt.date).size()
+    return _downsample(daily_counts.index.to_numpy(), daily_counts.to_numpy())
+
+
+def _downsample(x, y, max_points=MAX_TREND_POINTS):
+    """Keep each bucket's min and max point so long trends keep their shape."""
+    if len(y) <= max_points:
+        return x, y
+    indices = []
+    for bucket in np.array_split(np.arange(len(y)), max_points // 2):
+        indices.extend((bucket[y[bucket].argmin()], bucket[y[bucket].argmax()]))
+    indices = np.unique(indices)
+    return x[indices], y[indices]
+
+
+def _value_counts(series):
+    """value_counts without the zero entries a categorical reports for unused categories."""
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
+def _bar_figure(x, y, title, x_title, y_title, colorscale=None, **trace_kwargs):
+    """Build a bar chart, optionally colored by its values on a continuous scale."""
+    if colorscale:
+        horizontal = trace_kwargs.get("orientation") == "h"
+        trace_kwargs["marker"] = dict(
+            color=x if horizontal else y,
+            colorscale=colorscale,
+            colorbar=dict(title=x_title if horizontal else y_title)
+        )
+    fig = go.Figure(go.Bar(x=x, y=y, **trace_kwargs))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        showlegend=False,
+        height=CHART_HEIGHT
+    )
+    return fig
+
+
+def _line_figure(x, y, title, x_title, y_title):
+    """Build a WebGL line-with-markers chart."""
+    fig = go.Figure(go.Scattergl(x=x, y=y, mode="lines+markers"))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        height=CHART_HEIGHT
+    )
+    return fig
 
 
 class ChartFactory:
@@ -18,15 +80,14 @@ class ChartFactory:
         if "Doctor" not in df.columns:
             return None
             
-        doctor_counts = df["Doctor"].value_counts()
-        fig = px.bar(
-            x=doctor_counts.index,
-            y=doctor_counts.values,
+        doctor_counts = _value_counts(df["Doctor"])
+        return _bar_figure(
+            doctor_counts.index.to_numpy(),
+            doctor_counts.to_numpy(),
             title="Patients per Doctor",
-            labels={"x": "Doctor", "y": "Patients"}
+            x_title="Doctor",
+            y_title="Patients"
         )
-        fig.update_layout(showlegend=False, height=CHART_HEIGHT)
-        return fig
     
     @staticmethod
     def create_eligibility_status_chart(df):
@@ -34,14 +95,14 @@ class ChartFactory:
         if "Eligibility Status" not in df.columns:
             return None
             
-        status_counts = df["Eligibility Status"].value_counts()
-        fig = px.pie(
-            values=status_counts.values,
-            names=status_counts.index,
-            title="Eligibility Status"
-        )
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        fig.update_layout(height=CHART_HEIGHT)
+        status_counts = _value_counts(df["Eligibility Status"])
+        fig = go.Figure(go.Pie(
+            values=status_counts.to_numpy(),
+            labels=status_counts.index.to_numpy(),
+            textposition='inside',
+            textinfo='percent+label'
+        ))
+        fig.update_layout(title="Eligibility Status", height=CHART_HEIGHT)
         return fig
     
     @staticmethod
@@ -50,17 +111,15 @@ class ChartFactory:
         if "Authorization Status" not in df.columns:
             return None
             
-        status_counts = df["Authorization Status"].value_counts()
-        fig = px.bar(
-            x=status_counts.index,
-            y=status_counts.values,
+        status_counts = _value_counts(df["Authorization Status"])
+        return _bar_figure(
+            status_counts.index.to_numpy(),
+            status_counts.to_numpy(),
             title="Authorization Status",
-            labels={"x": "Status", "y": "Count"},
-            color=status_counts.values,
-            color_continuous_scale=COLOR_SCHEMES["plasma"]
+            x_title="Status",
+            y_title="Count",
+            colorscale=COLOR_SCHEMES["plasma"]
         )
-        fig.update_layout(showlegend=False, height=CHART_HEIGHT)
-        return fig
     
     @staticmethod
     def create_patient_status_heatmap(df):
@@ -68,19 +127,28 @@ class ChartFactory:
         if "Doctor" not in df.columns or "Eligibility Status" not in df.columns:
             return None
             
-        eligibility_doctor = pd.crosstab(df['Doctor'], df['Eligibility Status'])
-        fig = px.imshow(
-            eligibility_doctor.values,
-            x=eligibility_doctor.columns,
-            y=eligibility_doctor.index,
-            title="Patient Eligibility Status by Doctor (Heatmap)",
-            color_continuous_scale=COLOR_SCHEMES["rdylbu"],
-            text_auto=True
-        )
+        pairs = df[['Doctor', 'Eligibility Status']].dropna()
+        doctor_codes, doctors = pd.factorize(pairs['Doctor'], sort=True)
+        status_codes, statuses = pd.factorize(pairs['Eligibility Status'], sort=True)
+        counts = np.bincount(
+            doctor_codes * len(statuses) + status_codes,
+            minlength=len(doctors) * len(statuses)
+        ).reshape(len(doctors), len(statuses))
+        # Only label cells worth reading; this keeps the payload small on wide matrices
+        cell_text = np.where(counts >= HEATMAP_TEXT_MIN_COUNT, counts.astype(str), "")
+        fig = go.Figure(go.Heatmap(
+            z=counts,
+            x=np.asarray(statuses),
+            y=np.asarray(doctors),
+            colorscale=COLOR_SCHEMES["rdylbu"],
+            text=cell_text,
+            texttemplate="%{text}"
+        ))
         fig.update_layout(
+            title="Patient Eligibility Status by Doctor (Heatmap)",
             height=CHART_HEIGHT, 
             xaxis_title="Eligibility Status", 
-            yaxis_title="Doctor"
+            yaxis=dict(title="Doctor", autorange="reversed")
         )
         return fig
     
@@ -90,29 +158,31 @@ class ChartFactory:
         if "Doctor" not in df.columns or "Authorization Status" not in df.columns:
             return None
             
-        doctor_stats = df.groupby('Doctor').agg(
-            Total_Patients=('Authorization Status', 'count'),
-            Completed=('Authorization Status', 
-                      lambda x: x.fillna('').astype(str).str.strip().str.lower().eq('done').sum())
-        ).reset_index()
+        auth_status = DataProcessor.get_normalized_status(
+            df, NORMALIZED_AUTHORIZATION_COLUMN, 'Authorization Status'
+        )
+        doctors = df['Doctor']
+        doctor_stats = pd.DataFrame({
+            'Total_Patients': df['Authorization Status'].groupby(doctors, observed=True).count(),
+            'Completed': auth_status.eq('done').groupby(doctors, observed=True).sum()
+        }).rename_axis('Doctor').reset_index()
         
         doctor_stats['Completion_Rate'] = (
             doctor_stats['Completed'] / doctor_stats['Total_Patients'] * 100
         ).round(1)
         
-        fig = px.bar(
-            doctor_stats,
-            x='Doctor',
-            y='Completion_Rate',
+        completion_rate = doctor_stats['Completion_Rate'].to_numpy()
+        return _bar_figure(
+            doctor_stats['Doctor'].to_numpy(),
+            completion_rate,
             title="Authorization Completion Rate by Doctor (%)",
-            labels={"Completion_Rate": "Completion Rate (%)", "Doctor": "Doctor"},
-            color='Completion_Rate',
-            color_continuous_scale=COLOR_SCHEMES["greens"],
-            text='Completion_Rate'
+            x_title="Doctor",
+            y_title="Completion Rate (%)",
+            colorscale=COLOR_SCHEMES["greens"],
+            text=completion_rate,
+            texttemplate='%{text}%',
+            textposition='outside'
         )
-        fig.update_traces(texttemplate='%{text}%', textposition='outside')
-        fig.update_layout(showlegend=False, height=CHART_HEIGHT)
-        return fig
     
     @staticmethod
     def create_time_trend_chart(df):
@@ -120,18 +190,14 @@ class ChartFactory:
         if "Today's Date" not in df.columns or not df["Today's Date"].notna().any():
             return None
             
-        daily_counts = df.groupby(df["Today's Date"].dt.date).size().reset_index()
-        daily_counts.columns = ["Date", "Patients Processed"]
-        
-        fig = px.line(
-            daily_counts,
-            x="Date",
-            y="Patients Processed",
+        dates, counts = _daily_trend(dataframe_fingerprint(df, ["Today's Date"]), df["Today's Date"])
+        return _line_figure(
+            dates,
+            counts,
             title="Processing Trend",
-            markers=True
+            x_title="Date",
+            y_title="Patients Processed"
         )
-        fig.update_layout(height=CHART_HEIGHT)
-        return fig
     
     @staticmethod
     def create_weekly_trend_chart(df):
@@ -139,22 +205,16 @@ class ChartFactory:
         if "Today's Date" not in df.columns or not df["Today's Date"].notna().any():
             return None
             
-        df_temp = df.copy()
-        df_temp['Week_Start'] = df_temp["Today's Date"].dt.to_period('W').dt.start_time
-        weekly_counts = df_temp.groupby('Week_Start').size().reset_index()
-        weekly_counts.columns = ["Week_Start", "Patients_Processed"]
-        
-        fig = px.bar(
-            weekly_counts,
-            x="Week_Start",
-            y="Patients_Processed",
+        week_start = df["Today's Date"].dt.to_period('W').dt.start_time
+        weekly_counts = week_start.groupby(week_start).size()
+        return _bar_figure(
+            weekly_counts.index.to_numpy(),
+            weekly_counts.to_numpy(),
             title="Weekly Patient Processing Trend",
-            labels={"Patients_Processed": "Patients Processed", "Week_Start": "Week"},
-            color="Patients_Processed",
-            color_continuous_scale=COLOR_SCHEMES["blues"]
+            x_title="Week",
+            y_title="Patients Processed",
+            colorscale=COLOR_SCHEMES["blues"]
         )
-        fig.update_layout(showlegend=False, height=CHART_HEIGHT)
-        return fig
     
     @staticmethod
     def create_monthly_trend_chart(df):
@@ -162,17 +222,15 @@ class ChartFactory:
         if "Month" not in df.columns or not df["Month"].notna().any():
             return None
             
-        monthly_counts = df["Month"].value_counts().sort_index()
-        fig = px.bar(
-            x=monthly_counts.index,
-            y=monthly_counts.values,
+        monthly_counts = _value_counts(df["Month"]).sort_index()
+        return _bar_figure(
+            monthly_counts.index.astype(str).to_numpy(),
+            monthly_counts.to_numpy(),
             title="Patients Processed per Month",
-            labels={"x": "Month", "y": "Number of Patients"},
-            color=monthly_counts.values,
-            color_continuous_scale=COLOR_SCHEMES["blues"]
+            x_title="Month",
+            y_title="Number of Patients",
+            colorscale=COLOR_SCHEMES["blues"]
         )
-        fig.update_layout(showlegend=False, height=CHART_HEIGHT)
-        return fig
     
     @staticmethod
     def create_status_combination_chart(df):
@@ -181,23 +239,29 @@ class ChartFactory:
         if not all(col in df.columns for col in required_cols):
             return None
             
-        df_temp = df.copy()
-        df_temp['Combined_Status'] = (
-            df_temp['Eligibility Status'] + ' + ' + df_temp['Authorization Status']
-        )
-        status_counts = df_temp['Combined_Status'].value_counts().head(10)
+        # Count combinations on integer codes instead of concatenated strings
+        elig_codes, elig_labels = pd.factorize(df['Eligibility Status'])
+        auth_codes, auth_labels = pd.factorize(df['Authorization Status'])
+        both_present = (elig_codes >= 0) & (auth_codes >= 0)
+        combo_codes = elig_codes[both_present] * len(auth_labels) + auth_codes[both_present]
+        combo_counts = np.bincount(combo_codes, minlength=len(elig_labels) * len(auth_labels))
+        top_combos = np.argsort(-combo_counts, kind="stable")[:10]
+        top_combos = top_combos[combo_counts[top_combos] > 0]
+        combo_labels = [
+            f"{elig_labels[code // len(auth_labels)]} + {auth_labels[code % len(auth_labels)]}"
+            for code in top_combos
+        ]
         
-        fig = px.bar(
-            x=status_counts.values,
-            y=status_counts.index,
-            orientation='h',
+        fig = _bar_figure(
+            combo_counts[top_combos],
+            combo_labels,
             title="Top Status Combinations (Eligibility + Authorization)",
-            labels={"x": "Count", "y": "Status Combination"},
-            color=status_counts.values,
-            color_continuous_scale=COLOR_SCHEMES["viridis"]
+            x_title="Count",
+            y_title="Status Combination",
+            colorscale=COLOR_SCHEMES["viridis"],
+            orientation='h'
         )
         fig.update_layout(
-            showlegend=False, 
             height=TALL_CHART_HEIGHT, 
             yaxis={'categoryorder':'total ascending'}
         )
@@ -209,27 +273,25 @@ class ChartFactory:
         if "Days Scheduled" not in df.columns or not df["Days Scheduled"].notna().any():
             return None
             
-        # Remove outliers using IQR
-        q1 = df["Days Scheduled"].quantile(0.25)
-        q3 = df["Days Scheduled"].quantile(0.75)
+        # Remove outliers using IQR, working on the single column only
+        days = df["Days Scheduled"].to_numpy(dtype=np.float64)
+        days = days[~np.isnan(days)]
+        q1, q3 = np.quantile(days, [0.25, 0.75])
         iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-        
-        filtered_data = df[
-            (df["Days Scheduled"] >= lower_bound) & 
-            (df["Days Scheduled"] <= upper_bound)
-        ]
+        filtered_days = days[(days >= q1 - 1.5 * iqr) & (days <= q3 + 1.5 * iqr)]
         
-        fig = px.histogram(
-            filtered_data,
-            x="Days Scheduled",
+        fig = go.Figure(go.Histogram(
+            x=filtered_days,
+            nbinsx=20,
+            marker_color="#636EFA"
+        ))
+        fig.update_layout(
             title="Distribution of Days Scheduled",
-            labels={"Days Scheduled": "Days Scheduled", "count": "Number of Patients"},
-            nbins=20,
-            color_discrete_sequence=["#636EFA"]
+            xaxis_title="Days Scheduled",
+            yaxis_title="Number of Patients",
+            height=CHART_HEIGHT,
+            showlegend=False
         )
-        fig.update_layout(height=CHART_HEIGHT, showlegend=False)
         return fig
     
     @staticmethod
@@ -238,20 +300,16 @@ class ChartFactory:
         if "Today's Date" not in df.columns or not df["Today's Date"].notna().any():
             return None
             
-        df_temp = df.copy()
-        df_temp['Hour'] = df_temp["Today's Date"].dt.hour
-        hourly_counts = df_temp.groupby('Hour').size().reset_index()
-        hourly_counts.columns = ["Hour", "Count"]
-        
-        fig = px.line(
-            hourly_counts,
-            x="Hour",
-            y="Count",
+        hour = df["Today's Date"].dt.hour
+        hourly_counts = hour.value_counts().sort_index()
+        fig = _line_figure(
+            hourly_counts.index.to_numpy(),
+            hourly_counts.to_numpy(),
             title="Patient Processing by Hour of Day",
-            markers=True,
-            labels={"Hour": "Hour of Day", "Count": "Patients Processed"}
+            x_title="Hour of Day",
+            y_title="Patients Processed"
         )
-        fig.update_layout(height=CHART_HEIGHT, xaxis=dict(tickmode='linear', dtick=2))
+        fig.update_layout(xaxis=dict(tickmode='linear', dtick=2))
         return fig
 
     @staticmethod
@@ -260,18 +318,20 @@ class ChartFactory:
         if "Month" not in df.columns or not df["Month"].notna().any():
             return None
         
-        monthly_counts = df["Month"].value_counts().sort_index()
+        monthly_counts = df["Month"].value_counts(sort=False)
         above_700 = monthly_counts[monthly_counts > 700]
-        total_above_700 = above_700.sum()
         if above_700.empty:
             return None
-        fig = px.bar(
-            x=above_700.index,
-            y=above_700.values,
+        # Only the (few) qualifying months need ordering
+        above_700 = above_700.sort_index()
+        total_above_700 = above_700.sum()
+        fig = _bar_figure(
+            above_700.index.astype(str).to_numpy(),
+            above_700.to_numpy(),
             title=f"Months with >700 Patients (Total: {total_above_700})",
-            labels={"x": "Month", "y": "Number of Patients"},
-            color=above_700.values,
-            color_continuous_scale=COLOR_SCHEMES["blues"]
+            x_title="Month",
+            y_title="Number of Patients",
+            colorscale=COLOR_SCHEMES["blues"]
         )
         fig.add_annotation(
             text=f"Total patients in months >700: {total_above_700}",
@@ -279,5 +339,4 @@ class ChartFactory:
             x=0.5, y=1.08, showarrow=False,
             font=dict(size=16, color="#08519c")
         )
-        fig.update_layout(showlegend=False, height=CHART_HEIGHT)
         return fig
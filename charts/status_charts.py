@@ -6,6 +6,8 @@ Specialized charts for status analysis
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from config import NORMALIZED_ELIGIBILITY_COLUMN, NORMALIZED_AUTHORIZATION_COLUMN
+from utils.data_processor import DataProcessor
 
 
 class StatusCharts:
@@ -17,17 +19,18 @@ class StatusCharts:
         st.markdown('<div class="section-header">Eligibility Status Counts</div>', 
                    unsafe_allow_html=True)
         
-        elig_col = StatusCharts._get_eligibility_column(df)
+        elig_col = DataProcessor.resolve_columns(df)["eligibility"]
         if not elig_col:
             st.info("No eligibility column found in the data.")
             return
         
-        # Normalize case for status values
-        elig_normalized = df[elig_col].fillna("").str.strip().str.lower()
-        elig_counts = elig_normalized.value_counts(dropna=False)
-        elig_df = elig_counts.reset_index().rename(
-            columns={"index": elig_col, elig_col: "Count"}
+        # Status values are normalized to lowercase categories at load time
+        elig_normalized = DataProcessor.get_normalized_status(
+            df, NORMALIZED_ELIGIBILITY_COLUMN, elig_col
         )
+        elig_counts = elig_normalized.value_counts(dropna=False)
+        elig_counts = elig_counts[elig_counts > 0]
+        elig_df = elig_counts.rename_axis(elig_col).reset_index(name="Count")
         st.dataframe(elig_df, use_container_width=True, height=250)
         
         # Create percentage pie chart
@@ -39,38 +42,23 @@ class StatusCharts:
         st.markdown('<div class="section-header">Authorization Status Counts</div>', 
                    unsafe_allow_html=True)
         
-        auth_col = StatusCharts._get_authorization_column(df)
+        auth_col = DataProcessor.resolve_columns(df)["authorization"]
         if not auth_col:
             st.info("No authorization column found in the data.")
             return
         
-        # Normalize case for status values
-        auth_normalized = df[auth_col].fillna("").str.strip().str.lower()
-        auth_counts = auth_normalized.value_counts(dropna=False)
-        auth_df = auth_counts.reset_index().rename(
-            columns={"index": auth_col, auth_col: "Count"}
+        # Status values are normalized to lowercase categories at load time
+        auth_normalized = DataProcessor.get_normalized_status(
+            df, NORMALIZED_AUTHORIZATION_COLUMN, auth_col
         )
+        auth_counts = auth_normalized.value_counts(dropna=False)
+        auth_counts = auth_counts[auth_counts > 0]
+        auth_df = auth_counts.rename_axis(auth_col).reset_index(name="Count")
         st.dataframe(auth_df, use_container_width=True, height=250)
         
         # Create percentage pie chart
         StatusCharts._create_authorization_pie_chart(df, auth_col)
     
-    @staticmethod
-    def _get_eligibility_column(df):
-        """Get the eligibility column name"""
-        for col in ['Eligibility', 'Eligibility Status']:
-            if col in df.columns:
-                return col
-        return None
-    
-    @staticmethod
-    def _get_authorization_column(df):
-        """Get the authorization column name"""
-        for col in ['Authorization', 'Authorization Status']:
-            if col in df.columns:
-                return col
-        return None
-    
     @staticmethod
     def _create_eligibility_pie_chart(df, elig_col):
         """Create eligibility status pie chart"""
@@ -78,10 +66,13 @@ class StatusCharts:
         if total_patients == 0:
             return
             
-        elig_status_lower = df[elig_col].fillna("").str.strip().str.lower()
-        checked_count = (elig_status_lower == "checked").sum()
-        not_required_count = (elig_status_lower == "not required").sum()
-        processed_count = checked_count + not_required_count
+        elig_status_lower = DataProcessor.get_normalized_status(
+            df, NORMALIZED_ELIGIBILITY_COLUMN, elig_col
+        )
+        status_counts = elig_status_lower.value_counts()
+        processed_count = sum(
+            status_counts.get(status, 0) for status in ["checked", "not required"]
+        )
         processed_percentage = (processed_count / total_patients * 100)
         unprocessed_percentage = 100 - processed_percentage
         
@@ -102,11 +93,13 @@ class StatusCharts:
         if total_patients == 0:
             return
             
-        auth_status_lower = df[auth_col].fillna("").str.strip().str.lower()
-        done_count = (auth_status_lower == "done").sum()
-        not_required_count = (auth_status_lower == "not required").sum()
-        pending_count = (auth_status_lower == "pending").sum()
-        processed_count = done_count + not_required_count + pending_count
+        auth_status_lower = DataProcessor.get_normalized_status(
+            df, NORMALIZED_AUTHORIZATION_COLUMN, auth_col
+        )
+        status_counts = auth_status_lower.value_counts()
+        processed_count = sum(
+            status_counts.get(status, 0) for status in ["done", "not required", "pending"]
+        )
         processed_percentage = (processed_count / total_patients * 100)
         unprocessed_percentage = 100 - processed_percentage
         
@@ -5,6 +5,17 @@ Data table display and export functionality
 
 import streamlit as st
 from datetime import datetime
+from config import CACHE_TTL, DATA_TABLE_PAGE_SIZE
+from utils.cache_utils import dataframe_fingerprint
+from utils.data_processor import DataProcessor
+from utils.metrics import MetricsCalculator
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=4, show_spinner=False)
+def _to_csv_bytes(fingerprint, _df):
+    """Serialize a dataframe to CSV bytes once per data fingerprint."""
+    return _df.to_csv(index=False).encode()
+
 
 class DataTable:
     """Handles data table display and export."""
@@ -13,21 +24,10 @@ class DataTable:
         """Create the filtered data table section with Medsync calculation column and only relevant columns, plus a summary of combinations."""
         st.markdown('<div class="section-header">Filtered Data</div>', unsafe_allow_html=True)
         # Only keep relevant columns
-        elig_col = None
-        auth_col = None
-        name_col = None
-        for col in ["Eligibility Status", "Eligibility"]:
-            if col in filtered_df.columns:
-                elig_col = col
-                break
-        for col in ["Authorization Status", "Authorization"]:
-            if col in filtered_df.columns:
-                auth_col = col
-                break
-        for col in ["Patient Name", "Name"]:
-            if col in filtered_df.columns:
-                name_col = col
-                break
+        columns = DataProcessor.resolve_columns(filtered_df)
+        elig_col = columns["eligibility"]
+        auth_col = columns["authorization"]
+        name_col = columns["name"]
         display_cols = []
         if name_col:
             display_cols.append(name_col)
@@ -37,29 +37,14 @@ class DataTable:
             display_cols.append(auth_col)
         # Calculate Medsync calculation column
         if elig_col and auth_col:
-            elig = filtered_df[elig_col].fillna("").str.strip().str.lower()
-            auth = filtered_df[auth_col].fillna("").str.strip().str.lower()
-            def patient_score(e, a):
-                score = 0.0
-                # Eligibility
-                if e == "checked":
-                    score += 0.5
-                elif e == "see notes":
-                    score += 0.25
-                # Authorization
-                if a in ["done", "pending"]:
-                    score += 0.5
-                elif a == "see notes":
-                    score += 0.25
-                return score
-            medsync_calc = [patient_score(e, a) for e, a in zip(elig, auth)]
+            medsync_calc = MetricsCalculator.patient_scores(filtered_df)
             filtered_df = filtered_df.copy()
             filtered_df["Medsync calculation"] = medsync_calc
             display_cols.append("Medsync calculation")
             # Show only the selected columns
             display_df = filtered_df[display_cols] if display_cols else filtered_df
             with st.expander(f"View Filtered Data ({len(display_df)} rows)", expanded=True):
-                st.dataframe(display_df, use_container_width=True)
+                DataTable._display_paginated(display_df)
                 DataTable._create_export_button(display_df)
             # Remove the old summary and instead show a static calculation rules table
             # Split into two tables side by side
@@ -91,13 +76,32 @@ class DataTable:
             # Show only the selected columns
             display_df = filtered_df[display_cols] if display_cols else filtered_df
             with st.expander(f"View Filtered Data ({len(display_df)} rows)", expanded=True):
-                st.dataframe(display_df, use_container_width=True)
+                DataTable._display_paginated(display_df)
                 DataTable._create_export_button(display_df)
     @staticmethod
+    def _display_paginated(display_df):
+        """Display one page of the dataframe so only that page is sent to the browser."""
+        page_count = max(1, -(-len(display_df) // DATA_TABLE_PAGE_SIZE))
+        page = 1
+        if page_count > 1:
+            # The page lives only in session state (no widget default), so it can be
+            # clamped into range after the filters shrink the data
+            st.session_state.setdefault("data_table_page", 1)
+            st.session_state["data_table_page"] = min(st.session_state["data_table_page"], page_count)
+            page = st.number_input(
+                f"Page (of {page_count}, {DATA_TABLE_PAGE_SIZE} rows each)",
+                min_value=1,
+                max_value=page_count,
+                step=1,
+                key="data_table_page"
+            )
+        start = (page - 1) * DATA_TABLE_PAGE_SIZE
+        st.dataframe(display_df.iloc[start:start + DATA_TABLE_PAGE_SIZE], use_container_width=True)
+    @staticmethod
     def _create_export_button(filtered_df):
         """Create CSV export button."""
         if st.button("Download Filtered Data as CSV"):
-            csv = filtered_df.to_csv(index=False)
+            csv = _to_csv_bytes(dataframe_fingerprint(filtered_df), filtered_df)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"filtered_medsync_data_{timestamp}.csv"
             st.download_button(
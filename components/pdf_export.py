@@ -4,7 +4,18 @@ PDF Export component for MedSync Dashboard
 """
 
 import streamlit as st
-from utils.pdf_generator import PDFReportGenerator
+from datetime import datetime
+from config import PDF_CACHE_TTL
+from utils.cache_utils import dataframe_fingerprint
+
+
+@st.cache_data(ttl=PDF_CACHE_TTL, max_entries=4, show_spinner=False)
+def _render_report(fingerprint, filters, _filtered_df):
+    """Render the PDF report bytes once per (data fingerprint, filters) pair."""
+    # Imported on demand so reportlab/matplotlib only load when a report is requested
+    from utils.pdf_generator import PDFReportGenerator
+    return PDFReportGenerator().generate_report(_filtered_df, filters).getvalue()
+
 
 class PDFExport:
     """Handles PDF export functionality."""
@@ -27,14 +38,12 @@ class PDFExport:
         """Generate PDF report and provide download link."""
         try:
             with st.spinner("Generating PDF report..."):
-                pdf_generator = PDFReportGenerator()
-                pdf_buffer = pdf_generator.generate_report(filtered_df, filters)
-                from datetime import datetime
+                pdf_bytes = _render_report(dataframe_fingerprint(filtered_df), filters, filtered_df)
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 filename = f"medsync_report_{timestamp}.pdf"
                 st.sidebar.download_button(
                     label="Download PDF Report",
-                    data=pdf_buffer.getvalue(),
+                    data=pdf_bytes,
                     file_name=filename,
                     mime="application/pdf",
                     key="download_pdf",
@@ -3,6 +3,7 @@
 Sidebar components for filtering data and PDF export
 """
 
+import pandas as pd
 import streamlit as st
 from components.pdf_export import PDFExport
 
@@ -32,28 +33,32 @@ class Sidebar:
         """Create doctor selection filter."""
         if "Doctor" not in df.columns:
             return "All"
-        doctors = ["All"] + sorted(df["Doctor"].dropna().unique().tolist())
+        doctors = ["All"] + df["Doctor"].cat.categories.tolist()
         return st.sidebar.selectbox("Select Doctor", doctors, key="doctor_filter")
     @staticmethod
     def _create_eligibility_filter(df):
         """Create eligibility status filter."""
         if "Eligibility Status" not in df.columns:
             return "All"
-        eligibility_statuses = ["All"] + sorted(df["Eligibility Status"].dropna().unique().tolist())
+        eligibility_statuses = ["All"] + df["Eligibility Status"].cat.categories.tolist()
         return st.sidebar.selectbox("Select Eligibility Status", eligibility_statuses, key="eligibility_filter")
     @staticmethod
     def _create_authorization_filter(df):
         """Create authorization status filter."""
         if "Authorization Status" not in df.columns:
             return "All"
-        auth_statuses = ["All"] + sorted(df["Authorization Status"].dropna().unique().tolist())
+        auth_statuses = ["All"] + df["Authorization Status"].cat.categories.tolist()
         return st.sidebar.selectbox("Select Authorization Status", auth_statuses, key="authorization_filter")
     @staticmethod
     def _create_date_filter(df):
         """Create date range filter."""
-        if "Today's Date" not in df.columns or not df["Today's Date"].notna().any():
+        if "Today's Date" not in df.columns:
             return None
-        min_date = df["Today's Date"].min().date()
+        # min() is NaT only when the column has no valid dates, so no separate notna() scan
+        min_date = df["Today's Date"].min()
+        if pd.isna(min_date):
+            return None
+        min_date = min_date.date()
         max_date = df["Today's Date"].max().date()
         return st.sidebar.date_input(
             "Select Date Range",
@@ -20,13 +20,34 @@ EXPECTED_COLUMNS = [
     "Days Scheduled"
 ]
 
+ELIGIBILITY_COLUMNS = ["Eligibility Status", "Eligibility"]
+AUTHORIZATION_COLUMNS = ["Authorization Status", "Authorization"]
+PATIENT_NAME_COLUMNS = ["Patient Name", "Name"]
+
+# Low-cardinality columns stored as pandas categoricals after cleaning
+CATEGORICAL_COLUMNS = ["Doctor", "Eligibility Status", "Authorization Status"]
+
+COLUMN_VARIANTS = {
+    "eligibility": ELIGIBILITY_COLUMNS,
+    "authorization": AUTHORIZATION_COLUMNS,
+    "name": PATIENT_NAME_COLUMNS
+}
+
+# Lowercased categorical copies of the status columns, added at load time
+NORMALIZED_ELIGIBILITY_COLUMN = "_elig_norm"
+NORMALIZED_AUTHORIZATION_COLUMN = "_auth_norm"
+
 LOGO_FILES = [
     "company_logo.png"
 ]
 
 CHART_HEIGHT = 400
 HEATMAP_HEIGHT = 400
+HEATMAP_TEXT_MIN_COUNT = 1
 TALL_CHART_HEIGHT = 600
+MAX_TREND_POINTS = 1000
+MAX_CHART_WORKERS = 8
+DATA_TABLE_PAGE_SIZE = 500
 
 COLOR_SCHEMES = {
     "primary": "#667eea",
@@ -40,5 +61,21 @@ COLOR_SCHEMES = {
     "rdylbu": "RdYlBu_r"
 }
 
+ELIGIBILITY_SCORES = {
+    "checked": 0.5,
+    "see notes": 0.25
+}
+
+AUTHORIZATION_SCORES = {
+    "done": 0.5,
+    "pending": 0.5,
+    "see notes": 0.25
+}
+
 WORKING_DAYS = [6, 0, 1, 2, 3]
 DATE_FILTER_THRESHOLD = 0.1
+
+CACHE_TTL = 3600
+GSHEET_CACHE_TTL = 600
+CSV_CHUNK_SIZE = 20_000
+PDF_CACHE_TTL = 300
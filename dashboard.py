@@ -5,8 +5,12 @@ Modular and organized dashboard for patient data analysis
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-from config import PAGE_CONFIG
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from config import PAGE_CONFIG, MAX_CHART_WORKERS
 from styles import get_custom_css
 from components.header import Header
 from components.data_input import DataInput
@@ -54,60 +58,20 @@ class MedSyncDashboard:
             StatusCharts.create_authorization_status_section(filtered_df)
         self._display_charts(filtered_df)
         if "Month" in filtered_df.columns and filtered_df["Month"].notna().any():
-            # Calculate fully processed patients per month using the new logic
-            months = filtered_df["Month"].dropna().unique()
-            months = sorted(months)
-            def patient_score(e, a):
-                score = 0.0
-                # Eligibility
-                if e == "checked":
-                    score += 0.5
-                elif e == "see notes":
-                    score += 0.25
-                # Authorization
-                if a in ["done", "pending"]:
-                    score += 0.5
-                elif a == "see notes":
-                    score += 0.25
-                return score
-            fully_processed_per_month = []
-            for m in months:
-                month_df = filtered_df[filtered_df["Month"] == m]
-                elig_col = None
-                auth_col = None
-                for col in ["Eligibility Status", "Eligibility"]:
-                    if col in month_df.columns:
-                        elig_col = col
-                        break
-                for col in ["Authorization Status", "Authorization"]:
-                    if col in month_df.columns:
-                        auth_col = col
-                        break
-                if elig_col and auth_col:
-                    elig = month_df[elig_col].fillna("").str.strip().str.lower()
-                    auth = month_df[auth_col].fillna("").str.strip().str.lower()
-                    count = sum(patient_score(e, a) for e, a in zip(elig, auth))
-                else:
-                    count = 0
-                fully_processed_per_month.append(count)
-            months_formatted = [
-                pd.Period(m).strftime('%B %Y') if m else str(m)
-                for m in months
-            ]
-            above_700_col = [count - 700 if count > 700 else 0 for count in fully_processed_per_month]
+            # Calculate fully processed patients per month from the vectorized row scores
+            scores = MetricsCalculator.patient_scores(filtered_df)
+            if scores is None:
+                scores = pd.Series(0.0, index=filtered_df.index)
+            monthly_scores = scores.groupby(filtered_df["Month"], observed=True).sum()
+            fully_processed_per_month = monthly_scores.to_numpy()
+            months_formatted = monthly_scores.index.strftime('%B %Y').tolist()
+            above_700_col = np.maximum(fully_processed_per_month - 700, 0)
+            # Build the table with its Total row in one go instead of enlarging it afterwards
             df_all_months = pd.DataFrame({
-                "Month": months_formatted,
-                "Fully Processed Patient Count": fully_processed_per_month,
-                "Above 700": above_700_col
+                "Month": months_formatted + ["Total"],
+                "Fully Processed Patient Count": np.append(fully_processed_per_month, fully_processed_per_month.sum()),
+                "Above 700": np.append(above_700_col, above_700_col.sum())
             })
-            total_patients = sum(fully_processed_per_month)
-            total_above_700 = sum(above_700_col)
-            total_row = pd.DataFrame({
-                "Month": ["Total"],
-                "Fully Processed Patient Count": [total_patients],
-                "Above 700": [total_above_700]
-            })
-            df_all_months = pd.concat([df_all_months, total_row], ignore_index=True)
             st.markdown('<div class="section-header">Monthly Patient Counts (with Above 700)</div>', unsafe_allow_html=True)
             st.dataframe(df_all_months, use_container_width=True)
         MetricsCalculator.create_performance_metrics(filtered_df, use_fully_processed=True)
@@ -129,8 +93,14 @@ class MedSyncDashboard:
             ChartFactory.create_days_scheduled_distribution,
             ChartFactory.create_processing_timeline_chart
         ]
-        for chart_func in chart_functions:
-            fig = chart_func(filtered_df)
+        # Build the figures concurrently (pandas/numpy release the GIL), then render them in order
+        ctx = get_script_run_ctx()
+        def build(chart_func):
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return chart_func(filtered_df)
+        with ThreadPoolExecutor(max_workers=min(MAX_CHART_WORKERS, len(chart_functions))) as executor:
+            figures = list(executor.map(build, chart_functions))
+        for fig in figures:
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
 
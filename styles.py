@@ -3,9 +3,9 @@
 CSS styling for MedSync Dashboard
 """
 
-def get_custom_css():
-    """Return the custom CSS for the dashboard."""
-    return """
+import re
+
+_RAW_CSS = """
 <style>
     .main-header-container {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -101,3 +101,10 @@ def get_custom_css():
     }
 </style>
 """
+
+# Minified once at import: comments dropped, whitespace collapsed
+_CSS = re.sub(r"\s+", " ", re.sub(r"/\*.*?\*/", "", _RAW_CSS, flags=re.S)).strip()
+
+def get_custom_css():
+    """Return the custom CSS for the dashboard."""
+    return _CSS
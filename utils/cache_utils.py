@@ -0,0 +1,19 @@
+# utils/cache_utils.py
+"""
+Caching helpers for MedSync Dashboard
+"""
+
+import hashlib
+import pandas as pd
+
+
+def dataframe_fingerprint(df, columns=None):
+    """Return a hashable key for the contents of the given dataframe columns."""
+    subset = df if columns is None else df[list(columns)]
+    row_hashes = pd.util.hash_pandas_object(subset, index=False).to_numpy()
+    return (
+        tuple(subset.columns),
+        subset.shape,
+        tuple(str(dtype) for dtype in subset.dtypes),
+        hashlib.md5(row_hashes.tobytes()).hexdigest()
+    )
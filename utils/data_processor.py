@@ -3,10 +3,27 @@
 Data loading and processing utilities for MedSync Dashboard
 """
 
+import functools
+import io
+import numpy as np
 import pandas as pd
 import streamlit as st
 from datetime import datetime
-from config import EXPECTED_COLUMNS, DATE_FILTER_THRESHOLD
+from config import (
+    EXPECTED_COLUMNS, DATE_FILTER_THRESHOLD, COLUMN_VARIANTS, CATEGORICAL_COLUMNS,
+    CACHE_TTL, GSHEET_CACHE_TTL, CSV_CHUNK_SIZE,
+    NORMALIZED_ELIGIBILITY_COLUMN, NORMALIZED_AUTHORIZATION_COLUMN
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_columns(columns):
+    """Map each logical column to the first of its variants present in columns."""
+    return {
+        role: next((col for col in variants if col in columns), None)
+        for role, variants in COLUMN_VARIANTS.items()
+    }
+
 
 class DataProcessor:
     """Handles data loading, cleaning, and preprocessing."""
@@ -16,18 +33,17 @@ class DataProcessor:
         try:
             df = None
             if uploaded_file is not None:
-                df = pd.read_excel(uploaded_file)
+                df = DataProcessor._load_excel(uploaded_file.getvalue())
             elif gsheet_url:
                 if 'docs.google.com' in gsheet_url:
                     if '/edit' in gsheet_url:
                         gsheet_url = gsheet_url.split('/edit')[0] + '/export?format=csv'
                     elif not gsheet_url.endswith('export?format=csv'):
                         gsheet_url += '/export?format=csv'
-                df = pd.read_csv(gsheet_url)
+                df = DataProcessor._load_gsheet(gsheet_url)
             else:
                 st.warning("Please upload an Excel file or provide a Google Sheet link.")
                 return None
-            df = DataProcessor._clean_data(df)
             if df is not None:
                 st.success(f"Loaded {len(df)} records ready for analysis")
             return df
@@ -35,6 +51,19 @@ class DataProcessor:
             st.error(f"Error loading data: {str(e)}")
             return None
     @staticmethod
+    @st.cache_data(ttl=CACHE_TTL, max_entries=8, show_spinner=False)
+    def _load_excel(file_bytes):
+        """Parse and clean an uploaded Excel file, cached on its raw bytes."""
+        return DataProcessor._clean_data(pd.read_excel(io.BytesIO(file_bytes), engine="calamine"))
+    @staticmethod
+    @st.cache_data(ttl=GSHEET_CACHE_TTL, max_entries=8, show_spinner=False)
+    def _load_gsheet(csv_url):
+        """Download and clean a Google Sheet CSV export, cached on its URL."""
+        # Read the export in chunks, dropping all-empty rows from each before concatenating
+        chunks = pd.read_csv(csv_url, chunksize=CSV_CHUNK_SIZE)
+        df = pd.concat((chunk.dropna(how='all') for chunk in chunks), ignore_index=True)
+        return DataProcessor._clean_data(df)
+    @staticmethod
     def _clean_data(df):
         """Clean and preprocess the dataframe."""
         df = df.dropna(how='all')
@@ -43,20 +72,29 @@ class DataProcessor:
         df = DataProcessor._process_dates(df)
         if "Days Scheduled" in df.columns:
             df["Days Scheduled"] = pd.to_numeric(df["Days Scheduled"], errors='coerce')
+        df = DataProcessor._add_normalized_status_columns(df)
         df = DataProcessor._add_derived_columns(df)
+        df = DataProcessor._convert_categoricals(df)
         return df
     @staticmethod
     def _map_columns(df):
         """Map similar column names to expected columns."""
         if not all(col in df.columns for col in EXPECTED_COLUMNS):
+            # Normalize every actual column name once instead of once per expected column
+            normalized = {}
+            for actual_col in df.columns:
+                normalized.setdefault(actual_col.lower().replace(" ", ""), actual_col)
             column_mapping = {}
             for expected_col in EXPECTED_COLUMNS:
-                for actual_col in df.columns:
-                    if expected_col.lower().replace(" ", "") in actual_col.lower().replace(" ", ""):
-                        column_mapping[actual_col] = expected_col
-                        break
+                key = expected_col.lower().replace(" ", "")
+                actual_col = normalized.get(key)
+                if actual_col is None:
+                    actual_col = next((col for norm, col in normalized.items() if key in norm), None)
+                # Each actual column is renamed at most once
+                if actual_col is not None and actual_col not in column_mapping:
+                    column_mapping[actual_col] = expected_col
             if column_mapping:
-                df = df.rename(columns=column_mapping)
+                df.rename(columns=column_mapping, inplace=True)
         return df
     @staticmethod
     def _process_dates(df):
@@ -67,15 +105,14 @@ class DataProcessor:
         invalid_dates = df["Today's Date"].isna().sum()
         if invalid_dates > len(df) * DATE_FILTER_THRESHOLD:
             st.warning(f"⚠️ Found {invalid_dates} rows with invalid dates")
-        valid_dates = df[df["Today's Date"].notna()]["Today's Date"]
-        if len(valid_dates) > 0:
-            today = datetime.now().date()
-            future_count = (valid_dates.dt.date > today).sum()
-            if future_count > 0:
-                st.warning(f"Found {future_count} rows with future dates")
-        today = datetime.now().date()
+        # Compare timestamps directly against the start of tomorrow instead of per-row .dt.date
+        tomorrow = pd.Timestamp(datetime.now().date()) + pd.Timedelta(days=1)
+        dates = df["Today's Date"]
+        future_count = (dates >= tomorrow).sum()
+        if future_count > 0:
+            st.warning(f"Found {future_count} rows with future dates")
         before_date_filter = len(df)
-        df = df[df["Today's Date"].notna() & (df["Today's Date"].dt.date <= today)]
+        df = df[dates < tomorrow]
         after_date_filter = len(df)
         if before_date_filter != after_date_filter:
             removed_count = before_date_filter - after_date_filter
@@ -83,29 +120,68 @@ class DataProcessor:
                 st.info(f"Filtered out {removed_count} rows with invalid/future dates")
         return df
     @staticmethod
+    def _add_normalized_status_columns(df):
+        """Store normalized status columns once so consumers can skip string ops."""
+        columns = DataProcessor.resolve_columns(df)
+        for normalized_col, role in [
+            (NORMALIZED_ELIGIBILITY_COLUMN, "eligibility"),
+            (NORMALIZED_AUTHORIZATION_COLUMN, "authorization")
+        ]:
+            if columns[role]:
+                df[normalized_col] = DataProcessor.normalize_status(df[columns[role]])
+        return df
+    @staticmethod
+    def resolve_columns(df):
+        """Return the actual eligibility, authorization and name columns of df (or None)."""
+        return _resolve_columns(tuple(df.columns))
+    @staticmethod
+    def normalize_status(series):
+        """Strip and lowercase status values into a categorical Series."""
+        # Normalize each distinct value once with plain str methods, then broadcast through the codes
+        codes, uniques = pd.factorize(series)
+        normalized = [value.strip().lower() if isinstance(value, str) else np.nan for value in uniques]
+        # Missing values have code -1, which picks up the trailing ""
+        values = np.array(normalized + [""], dtype=object)[codes]
+        return pd.Series(values, index=series.index, name=series.name).astype("category")
+    @staticmethod
+    def get_normalized_status(df, normalized_col, source_col):
+        """Return the precomputed normalized status column, or compute it from source_col."""
+        if normalized_col in df.columns:
+            return df[normalized_col]
+        return DataProcessor.normalize_status(df[source_col])
+    @staticmethod
     def _add_derived_columns(df):
         """Add derived columns for analysis."""
         if "Today's Date" in df.columns:
-            df['Month'] = df["Today's Date"].dt.to_period('M').astype(str)
-            df['Week'] = df["Today's Date"].dt.to_period('W').astype(str)
+            # Keep Period dtype; format to strings only for display
+            df['Month'] = df["Today's Date"].dt.to_period('M')
+            df['Week'] = df["Today's Date"].dt.to_period('W')
         else:
             df['Month'] = None
             df['Week'] = None
         return df
     @staticmethod
+    def _convert_categoricals(df):
+        """Store low-cardinality columns as categoricals so filters and groupbys work on codes."""
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        return df
+    @staticmethod
     def apply_filters(df, filters):
         """Apply sidebar filters to the dataframe."""
-        filtered_df = df.copy()
+        # Combine every active filter into one mask and slice the frame once
+        mask = np.ones(len(df), dtype=bool)
         if filters.get('doctor') != "All" and "Doctor" in df.columns:
-            filtered_df = filtered_df[filtered_df["Doctor"] == filters['doctor']]
+            mask &= (df["Doctor"] == filters['doctor']).to_numpy()
         if filters.get('eligibility') != "All" and "Eligibility Status" in df.columns:
-            filtered_df = filtered_df[filtered_df["Eligibility Status"] == filters['eligibility']]
+            mask &= (df["Eligibility Status"] == filters['eligibility']).to_numpy()
         if filters.get('authorization') != "All" and "Authorization Status" in df.columns:
-            filtered_df = filtered_df[filtered_df["Authorization Status"] == filters['authorization']]
+            mask &= (df["Authorization Status"] == filters['authorization']).to_numpy()
         if filters.get('date_range') and "Today's Date" in df.columns and len(filters['date_range']) == 2:
             start_date, end_date = filters['date_range']
-            filtered_df = filtered_df[
-                (filtered_df["Today's Date"].dt.date >= start_date) & 
-                (filtered_df["Today's Date"].dt.date <= end_date)
-            ]
-        return filtered_df
+            dates = df["Today's Date"].to_numpy().astype("datetime64[D]")
+            mask &= (dates >= np.datetime64(start_date)) & (dates <= np.datetime64(end_date))
+        if mask.all():
+            return df
+        return df[mask]
@@ -5,25 +5,37 @@ Logo handling utilities for MedSync Dashboard
 
 import os
 import base64
+import functools
 import streamlit as st
 from config import LOGO_FILES
 
+
+@functools.lru_cache(maxsize=8)
+def _encode_logo(logo_path, mtime):
+    """Read and base64-encode a logo file; mtime keys the cache so edits are picked up."""
+    with open(logo_path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
 def get_logo_base64(logo_path):
     """Convert logo image to base64 string."""
     try:
         if os.path.exists(logo_path):
-            with open(logo_path, "rb") as f:
-                return base64.b64encode(f.read()).decode()
+            mtime = os.path.getmtime(logo_path)
+            return _encode_logo(logo_path, mtime)
     except Exception as e:
         st.error(f"Error loading logo: {e}")
     return None
 
+def _logo_html(logo_file, logo_base64):
+    """Build the <img> tag for an already-encoded logo file."""
+    file_extension = logo_file.split('.')[-1].lower()
+    mime_type = f"image/{file_extension if file_extension != 'svg' else 'svg+xml'}"
+    return f'''<img src="data:{mime_type};base64,{logo_base64}" style="width: 120px; height: 120px; border-radius: 12px; object-fit: cover; box-shadow: 0 4px 12px rgba(0,0,0,0.2);">'''
+
 def display_logo():
     """Display company logo or fallback."""
     for logo_file in LOGO_FILES:
         logo_base64 = get_logo_base64(logo_file)
         if logo_base64:
-            file_extension = logo_file.split('.')[-1].lower()
-            mime_type = f"image/{file_extension if file_extension != 'svg' else 'svg+xml'}"
-            return f'''<img src="data:{mime_type};base64,{logo_base64}" style="width: 120px; height: 120px; border-radius: 12px; object-fit: cover; box-shadow: 0 4px 12px rgba(0,0,0,0.2);">'''
+            return _logo_html(logo_file, logo_base64)
     return '<div class="logo-placeholder">🏥</div>'
@@ -4,43 +4,74 @@ Metrics calculation utilities for MedSync Dashboard
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from config import WORKING_DAYS
+from datetime import datetime, timedelta
+from config import (
+    WORKING_DAYS, ELIGIBILITY_SCORES, AUTHORIZATION_SCORES,
+    NORMALIZED_ELIGIBILITY_COLUMN, NORMALIZED_AUTHORIZATION_COLUMN
+)
+from utils.data_processor import DataProcessor
+
+# numpy weekmask (Monday first) marking the configured working days
+WORKING_WEEKMASK = np.isin(np.arange(7), WORKING_DAYS)
 
 class MetricsCalculator:
     """Handles calculation of various dashboard metrics."""
     @staticmethod
     def count_fully_processed_patients(df):
         """Count patients using the new additive calculation logic everywhere in the app."""
-        elig_col = MetricsCalculator._get_column_variant(df, ["Eligibility Status", "Eligibility"])
-        auth_col = MetricsCalculator._get_column_variant(df, ["Authorization Status", "Authorization"])
-        if not (elig_col and auth_col):
+        if df.empty:
             return 0
-
-        elig = df[elig_col].fillna("").str.strip().str.lower()
-        auth = df[auth_col].fillna("").str.strip().str.lower()
-        def patient_score(e, a):
-            score = 0.0
-            # Eligibility
-            if e == "checked":
-                score += 0.5
-            elif e == "see notes":
-                score += 0.25
-            # Authorization
-            if a in ["done", "pending"]:
-                score += 0.5
-            elif a == "see notes":
-                score += 0.25
-            return score
-        return sum(patient_score(e, a) for e, a in zip(elig, auth))
+        statuses = MetricsCalculator._normalized_statuses(df)
+        if statuses is None:
+            return 0
+        elig, auth = statuses
+        return float(
+            MetricsCalculator._total_score(elig, ELIGIBILITY_SCORES) +
+            MetricsCalculator._total_score(auth, AUTHORIZATION_SCORES)
+        )
+    @staticmethod
+    def patient_scores(df):
+        """Return the additive per-row patient score Series, or None without both status columns."""
+        statuses = MetricsCalculator._normalized_statuses(df)
+        if statuses is None:
+            return None
+        elig, auth = statuses
+        scores = (
+            MetricsCalculator._score_statuses(elig, ELIGIBILITY_SCORES) +
+            MetricsCalculator._score_statuses(auth, AUTHORIZATION_SCORES)
+        )
+        return pd.Series(scores, index=df.index)
     @staticmethod
-    def _get_column_variant(df, possible_names):
-        """Get the first available column name from a list of possibilities."""
-        for name in possible_names:
-            if name in df.columns:
-                return name
-        return None
+    def _normalized_statuses(df):
+        """Return the normalized (eligibility, authorization) Series, or None without both columns."""
+        columns = DataProcessor.resolve_columns(df)
+        elig_col, auth_col = columns["eligibility"], columns["authorization"]
+        if not (elig_col and auth_col):
+            return None
+        return (
+            DataProcessor.get_normalized_status(df, NORMALIZED_ELIGIBILITY_COLUMN, elig_col),
+            DataProcessor.get_normalized_status(df, NORMALIZED_AUTHORIZATION_COLUMN, auth_col)
+        )
+    @staticmethod
+    def _category_scores(statuses, scores):
+        """Return statuses as a categorical plus the score of each of its categories."""
+        statuses = statuses.astype("category")  # no-op for the load-time normalized columns
+        return statuses, statuses.cat.categories.map(scores).fillna(0.0).to_numpy(dtype=np.float64)
+    @staticmethod
+    def _score_statuses(statuses, scores):
+        """Score each row by gathering per-category scores through the categorical codes."""
+        statuses, category_scores = MetricsCalculator._category_scores(statuses, scores)
+        # Missing values have code -1, which picks up the trailing zero score
+        return np.append(category_scores, 0.0)[statuses.cat.codes.to_numpy()]
+    @staticmethod
+    def _total_score(statuses, scores):
+        """Sum the scores of all rows from per-category counts, without a per-row score array."""
+        statuses, category_scores = MetricsCalculator._category_scores(statuses, scores)
+        # Shift codes by one so missing values (-1) land in a zero-score bin
+        counts = np.bincount(statuses.cat.codes.to_numpy().astype(np.intp) + 1, minlength=len(category_scores) + 1)
+        return float(counts[1:] @ category_scores)
     @staticmethod
     def create_summary_metrics(df):
         """Display summary metrics cards."""
@@ -58,60 +89,62 @@ class MetricsCalculator:
         """Display performance metrics section. If use_fully_processed is True, use fully processed patient counts for averages."""
         st.markdown('<div class="section-header">Performance Metrics</div>', unsafe_allow_html=True)
         col1, col2, col3 = st.columns(3)
+        # Compute the numerator and the date span once and share them between the three averages
         if use_fully_processed:
-            count_func = MetricsCalculator.count_fully_processed_patients
+            total = MetricsCalculator.count_fully_processed_patients(df)
         else:
-            count_func = lambda d: len(d)
+            total = len(df)
+        date_bounds = MetricsCalculator._date_bounds(df)
         with col1:
-            avg_per_day = MetricsCalculator._calculate_avg_per_working_day(df, count_func)
+            avg_per_day = MetricsCalculator._calculate_avg_per_working_day(total, date_bounds)
             st.metric("Avg Fully Processed Patients per Working Day (Sun-Thurs)", avg_per_day)
         with col2:
-            avg_per_month = MetricsCalculator._calculate_avg_per_month(df, count_func)
+            avg_per_month = MetricsCalculator._calculate_avg_per_month(total, date_bounds)
             st.metric("Avg Fully Processed Patients per Month", avg_per_month)
         with col3:
-            avg_per_year = MetricsCalculator._calculate_avg_per_year(df, count_func)
+            avg_per_year = MetricsCalculator._calculate_avg_per_year(total, date_bounds)
             st.metric("Avg Fully Processed Patients per Year", avg_per_year)
 
     @staticmethod
-    def _calculate_avg_per_working_day(df, count_func=None):
+    def _date_bounds(df):
+        """Return the (min, max) Timestamps of Today's Date, or None without valid dates."""
+        if "Today's Date" not in df.columns:
+            return None
+        stats = df["Today's Date"].agg(['min', 'max', 'count'])
+        if stats['count'] == 0:
+            return None
+        return stats['min'], stats['max']
+    @staticmethod
+    def _calculate_avg_per_working_day(total, date_bounds):
         """Calculate average patients per working day."""
-        if count_func is None:
-            count_func = lambda d: len(d)
-        if "Today's Date" not in df.columns or not df["Today's Date"].notna().any():
+        if date_bounds is None:
             return "N/A"
-        min_date = df["Today's Date"].min().date()
-        max_date = df["Today's Date"].max().date()
-        all_days = pd.date_range(min_date, max_date)
-        working_days = [d for d in all_days if d.weekday() in WORKING_DAYS]
-        if len(working_days) > 0:
-            avg = count_func(df) / len(working_days)
+        min_date, max_date = (d.date() for d in date_bounds)
+        working_days = int(np.busday_count(min_date, max_date + timedelta(days=1), weekmask=WORKING_WEEKMASK))
+        if working_days > 0:
+            avg = total / working_days
             return f"{avg:.1f}"
         return "N/A"
     @staticmethod
-    def _calculate_avg_per_month(df, count_func=None):
+    def _calculate_avg_per_month(total, date_bounds):
         """Calculate average patients per month."""
-        if count_func is None:
-            count_func = lambda d: len(d)
-        if "Today's Date" not in df.columns or not df["Today's Date"].notna().any():
+        if date_bounds is None:
             return "N/A"
-        min_date = df["Today's Date"].min()
-        max_date = df["Today's Date"].max()
-        all_months = pd.period_range(min_date, max_date, freq='M')
-        if len(all_months) > 0:
-            avg = count_func(df) / len(all_months)
+        min_date, max_date = date_bounds
+        # Calendar months touched by the span, from the endpoints alone
+        months = (max_date.year - min_date.year) * 12 + (max_date.month - min_date.month) + 1
+        if months > 0:
+            avg = total / months
             return f"{avg:.1f}"
         return "N/A"
     @staticmethod
-    def _calculate_avg_per_year(df, count_func=None):
+    def _calculate_avg_per_year(total, date_bounds):
         """Calculate average patients per year."""
-        if count_func is None:
-            count_func = lambda d: len(d)
-        if "Today's Date" not in df.columns or not df["Today's Date"].notna().any():
+        if date_bounds is None:
             return "N/A"
-        min_date = df["Today's Date"].min()
-        max_date = df["Today's Date"].max()
-        all_years = pd.period_range(min_date, max_date, freq='Y')
-        if len(all_years) > 0:
-            avg = count_func(df) / len(all_years)
+        min_date, max_date = date_bounds
+        years = max_date.year - min_date.year + 1
+        if years > 0:
+            avg = total / years
             return f"{avg:.1f}"
         return "N/A"
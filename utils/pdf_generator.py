@@ -12,9 +12,11 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
+from utils.metrics import MetricsCalculator
 import plotly.io as pio
 from PIL import Image as PILImage
 import matplotlib.pyplot as plt
@@ -28,9 +30,10 @@ class PDFReportGenerator:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self._report_dates = None  # (dataframe, parsed dates) of the report being built
     
     def _setup_custom_styles(self):
-        """Setup custom paragraph styles for the report"""
+        """Setup custom paragraph and table styles for the report"""
         # Title style
         self.styles.add(ParagraphStyle(
             name='CustomTitle',
@@ -60,6 +63,62 @@ class PDFReportGenerator:
             spaceBefore=12,
             textColor=colors.HexColor('#34495e')
         ))
+        
+        # Metrics table style
+        self._metrics_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        ])
+        
+        # Status breakdown table style
+        self._status_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecf0f1')),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.lightgrey]),
+        ])
+        
+        # Doctor distribution table style
+        self._doctor_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        ])
+        
+        # Detailed data table style
+        self._data_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8e44ad')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ])
     
     def generate_report(self, filtered_df, filters, charts_data=None):
         """Generate a complete PDF report"""
@@ -138,20 +197,21 @@ class PDFReportGenerator:
         elements = []
         elements.append(Paragraph("Applied Filters", self.styles['SectionHeader']))
         
-        filter_text = "<b>The following filters were applied to generate this report:</b><br/><br/>"
+        filter_lines = ["<b>The following filters were applied to generate this report:</b><br/><br/>"]
         
         for filter_name, filter_value in filters.items():
             if filter_value:
                 if filter_name == 'date_range' and isinstance(filter_value, (list, tuple)) and len(filter_value) == 2:
-                    filter_text += f"• Date Range: {filter_value[0].strftime('%m/%d/%Y')} to {filter_value[1].strftime('%m/%d/%Y')}<br/>"
+                    filter_lines.append(f"• Date Range: {filter_value[0].strftime('%m/%d/%Y')} to {filter_value[1].strftime('%m/%d/%Y')}<br/>")
                 elif isinstance(filter_value, list) and len(filter_value) > 0:
-                    filter_text += f"• {filter_name.title()}: {', '.join(map(str, filter_value))}<br/>"
+                    filter_lines.append(f"• {filter_name.title()}: {', '.join(map(str, filter_value))}<br/>")
                 elif not isinstance(filter_value, list):
-                    filter_text += f"• {filter_name.title()}: {filter_value}<br/>"
+                    filter_lines.append(f"• {filter_name.title()}: {filter_value}<br/>")
         
         if not any(filters.values()):
-            filter_text += "• No filters applied - showing all data<br/>"
+            filter_lines.append("• No filters applied - showing all data<br/>")
         
+        filter_text = "".join(filter_lines)
         filter_para = Paragraph(filter_text, self.styles['Normal'])
         elements.append(filter_para)
         elements.append(Spacer(1, 20))
@@ -177,18 +237,7 @@ class PDFReportGenerator:
         ]
         
         metrics_table = Table(metrics_data, colWidths=[2.5*inch, 1.5*inch, 3*inch])
-        metrics_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ]))
+        metrics_table.setStyle(self._metrics_table_style)
         
         elements.append(metrics_table)
         elements.append(Spacer(1, 20))
@@ -227,34 +276,22 @@ class PDFReportGenerator:
         
         if status_col not in df.columns:
             return Paragraph(f"Status column not found in data", self.styles['Normal'])
+        if df.empty:
+            return Paragraph("No records match the current filters", self.styles['Normal'])
         
-        status_counts = df[status_col].value_counts().fillna('Unknown')
+        status_counts = df[status_col].value_counts()
+        status_counts = status_counts[status_counts > 0]  # unused categories
         total = len(df)
         
         # Create table data
-        table_data = [['Status', 'Count', 'Percentage']]
-        for status, count in status_counts.items():
-            percentage = (count / total * 100) if total > 0 else 0
-            table_data.append([str(status), f"{count:,}", f"{percentage:.1f}%"])
+        table_data = [['Status', 'Count', 'Percentage']] + self._count_rows(status_counts, total)
         
         # Add total row
         table_data.append(['Total', f"{total:,}", "100.0%"])
         
         # Create table
         table = Table(table_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.lightgrey]),
-        ]))
+        table.setStyle(self._status_table_style)
         
         return table
     
@@ -264,32 +301,31 @@ class PDFReportGenerator:
         
         if doctor_col not in df.columns:
             return Paragraph("Doctor/Provider column not found in data", self.styles['Normal'])
+        if df.empty:
+            return Paragraph("No records match the current filters", self.styles['Normal'])
         
-        doctor_counts = df[doctor_col].value_counts().head(10)  # Top 10 doctors
+        doctor_counts = df[doctor_col].value_counts()
+        doctor_counts = doctor_counts[doctor_counts > 0].head(10)  # Top 10 doctors
         total = len(df)
         
-        # Create table data
-        table_data = [['Doctor', 'Patients', 'Percentage']]
-        for doctor, count in doctor_counts.items():
-            percentage = (count / total * 100) if total > 0 else 0
-            table_data.append([str(doctor)[:30], f"{count:,}", f"{percentage:.1f}%"])  # Truncate long names
+        # Create table data, truncating long names
+        table_data = [['Doctor', 'Patients', 'Percentage']] + self._count_rows(doctor_counts, total, label_width=30)
         
         # Create table
         table = Table(table_data, colWidths=[3*inch, 1.5*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ]))
+        table.setStyle(self._doctor_table_style)
         
         return table
     
+    def _count_rows(self, counts, total, label_width=None):
+        """Build [label, count, percentage] table rows from a value_counts Series"""
+        values = counts.to_numpy()
+        percentages = values * (100.0 / total) if total > 0 else np.zeros(len(values))
+        return [
+            [str(label)[:label_width], f"{count:,}", f"{percentage:.1f}%"]
+            for label, count, percentage in zip(counts.index, values, percentages)
+        ]
+    
     def _create_data_table_section(self, df):
         """Create detailed data table section"""
         elements = []
@@ -313,18 +349,9 @@ class PDFReportGenerator:
         if not key_columns:
             key_columns = df.columns[:6].tolist()  # First 6 columns if no standard columns found
         
-        # Create table data
-        table_data = [key_columns]  # Header row
-        
-        for _, row in display_df.iterrows():
-            row_data = []
-            for col in key_columns:
-                value = str(row[col]) if pd.notna(row[col]) else ''
-                # Truncate long values
-                if len(value) > 20:
-                    value = value[:20] + '...'
-                row_data.append(value)
-            table_data.append(row_data)
+        # Format and truncate whole columns at once, then hand the rows to the table
+        cells = pd.DataFrame({col: self._format_column(display_df[col]) for col in key_columns})
+        table_data = [key_columns] + cells.to_numpy().tolist()
         
         # Calculate column widths
         col_width = 7*inch / len(key_columns)
@@ -332,23 +359,17 @@ class PDFReportGenerator:
         
         # Create table
         data_table = Table(table_data, colWidths=col_widths)
-        data_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8e44ad')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        data_table.setStyle(self._data_table_style)
         
         elements.append(data_table)
         
         return elements
     
+    def _format_column(self, series):
+        """Format a column as text cells, truncating long values"""
+        text = series.astype(object).where(series.notna(), '').astype(str)
+        return text.where(text.str.len() <= 20, text.str[:20] + '...')
+    
     def _calculate_key_metrics(self, df):
         """Calculate key metrics for the report"""
         metrics = {}
@@ -371,52 +392,20 @@ class PDFReportGenerator:
     
     def _count_fully_processed_patients(self, df):
         """Count patients using the new additive calculation logic everywhere in the PDF report."""
-        elig_col = self._get_column_variant(df, ["Eligibility Status", "Eligibility"])
-        auth_col = self._get_column_variant(df, ["Authorization Status", "Authorization"])
-        if not (elig_col and auth_col):
-            return 0
-
-        elig = df[elig_col].fillna("").str.strip().str.lower()
-        auth = df[auth_col].fillna("").str.strip().str.lower()
-        def patient_score(e, a):
-            score = 0.0
-            # Eligibility
-            if e == "checked":
-                score += 0.5
-            elif e == "see notes":
-                score += 0.25
-            # Authorization
-            if a in ["done", "pending"]:
-                score += 0.5
-            elif a == "see notes":
-                score += 0.25
-            return score
-        return sum(patient_score(e, a) for e, a in zip(elig, auth))
-    
-    def _get_column_variant(self, df, possible_names):
-        """Get the first available column name from a list of possibilities"""
-        for name in possible_names:
-            if name in df.columns:
-                return name
-        return None
+        # Same scoring as the dashboard, so the report and the app cannot drift apart
+        return MetricsCalculator.count_fully_processed_patients(df)
     
     def _calculate_avg_processing_days(self, df):
         """Calculate average processing days"""
-        # Look for date columns
-        date_columns = []
-        for col in df.columns:
-            if 'date' in col.lower() or 'scheduled' in col.lower():
-                date_columns.append(col)
-        
-        if date_columns:
+        valid_dates = self._get_report_dates(df)
+        if valid_dates is not None and len(valid_dates) > 0:
             try:
-                # Try to calculate days from first date column to today
-                date_col = date_columns[0]
-                df_dates = pd.to_datetime(df[date_col], errors='coerce')
-                valid_dates = df_dates.dropna()
-                if len(valid_dates) > 0:
-                    avg_days = (datetime.now() - valid_dates).dt.days.mean()
-                    return max(0, avg_days)  # Don't return negative days
+                # Whole days from each date to today (floored like Timedelta.days), averaged
+                # on int64 nanoseconds instead of via Timedelta Series
+                now_ns = pd.Timestamp.now().value
+                date_ns = valid_dates.to_numpy().astype("datetime64[ns]").view("int64")
+                avg_days = ((now_ns - date_ns) // pd.Timedelta(days=1).value).mean()
+                return max(0, avg_days)  # Don't return negative days
             except:
                 pass
         
@@ -424,25 +413,31 @@ class PDFReportGenerator:
     
     def _get_date_range(self, df):
         """Get the date range of the data"""
-        date_columns = []
-        for col in df.columns:
-            if 'date' in col.lower() or 'scheduled' in col.lower():
-                date_columns.append(col)
-        
-        if date_columns:
+        valid_dates = self._get_report_dates(df)
+        if valid_dates is not None and len(valid_dates) > 0:
             try:
-                date_col = date_columns[0]
-                df_dates = pd.to_datetime(df[date_col], errors='coerce')
-                valid_dates = df_dates.dropna()
-                if len(valid_dates) > 0:
-                    min_date = valid_dates.min().strftime('%m/%d/%Y')
-                    max_date = valid_dates.max().strftime('%m/%d/%Y')
-                    return f"{min_date} to {max_date}"
+                min_date = valid_dates.min().strftime('%m/%d/%Y')
+                max_date = valid_dates.max().strftime('%m/%d/%Y')
+                return f"{min_date} to {max_date}"
             except:
                 pass
         
         return "Date range not available"
     
+    def _get_report_dates(self, df):
+        """Parse the first date-like column once per report and reuse it"""
+        if self._report_dates is not None and self._report_dates[0] is df:
+            return self._report_dates[1]
+        date_columns = [col for col in df.columns if 'date' in (lower := col.lower()) or 'scheduled' in lower]
+        valid_dates = None
+        if date_columns:
+            try:
+                valid_dates = pd.to_datetime(df[date_columns[0]], errors='coerce').dropna()
+            except:
+                pass
+        self._report_dates = (df, valid_dates)
+        return valid_dates
+    
     @staticmethod
     def create_download_link(buffer, filename="medsync_report.pdf"):
         """Create a download link for the PDF"""